@@ -1,22 +1,34 @@
 import os
 import sys
-import json
 import base64
 from datetime import datetime
 import hashlib
+import hmac
+import queue
+import tempfile
+import threading
+import time
 import uuid
 import requests
 import io
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 
 # DON'T CHANGE THIS PATH
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from flask import Flask, request, jsonify, send_from_directory, send_file, redirect
+from flask import Flask, request, Response, send_from_directory, send_file, redirect
 from flask_cors import CORS
+from flask_compress import Compress
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 from dotenv import load_dotenv
+from whitenoise import WhiteNoise
 
 # Load environment variables
 load_dotenv()
@@ -24,7 +36,38 @@ load_dotenv()
 app = Flask(__name__, static_folder='static', static_url_path='')
 CORS(app)
 
-app.config['SECRET_KEY'] = 'your-secret-key-here'
+# Serve static assets from WhiteNoise (pre-compressed at startup) so
+# repeat visitors never hit the Python handlers. Only the fingerprinted
+# bundles under assets/ may cache forever — index.html and other stable
+# names must revalidate or a redeploy strands users on stale HTML.
+def _static_cache_headers(headers, path, url):
+    """Immutable 1-year caching for fingerprinted bundles, no-cache otherwise"""
+    if url.startswith('/assets/'):
+        headers['Cache-Control'] = 'max-age=31536000, public, immutable'
+    else:
+        headers['Cache-Control'] = 'no-cache'
+
+app.wsgi_app = WhiteNoise(
+    app.wsgi_app,
+    root=app.static_folder,
+    index_file=True,
+    autorefresh=False,
+    add_headers_function=_static_cache_headers
+)
+
+# Secrets come from the environment — no in-source fallbacks. A missing
+# SECRET_KEY gets an ephemeral random value rather than a known constant.
+app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
+if not app.config['SECRET_KEY']:
+    print("⚠️ SECRET_KEY not set, generating an ephemeral one for this process")
+    app.config['SECRET_KEY'] = os.urandom(32)
+
+# Compress large JSON responses (photo/collection listings are highly
+# repetitive, so this typically cuts ~80% of bytes on the wire)
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+Compress(app)
 
 # Debug: Print environment variables (without secrets)
 print("=== CLOUDINARY CONFIGURATION DEBUG ===")
@@ -63,6 +106,144 @@ print("==========================================")
 LOCAL_METADATA_FILE = 'photos_data.json'
 LOCAL_COLLECTIONS_FILE = 'collections_data.json'
 
+# Pooled HTTP session so raw downloads reuse TCP+TLS connections
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+# Last seen ETag + parsed body of the collections blob, for conditional GETs
+_COLLECTIONS_ETAG = None
+_COLLECTIONS_ETAG_BODY = None
+
+def _json_dumps(obj):
+    """Serialize to pretty-printed JSON bytes (orjson is ~5-10x stdlib json)"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+def _json_loads(data):
+    """Parse JSON from bytes or str"""
+    return orjson.loads(data)
+
+def _json_response(obj, status=200):
+    """Build a JSON response straight from orjson bytes, bypassing jsonify"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+# In-memory TTL cache so read endpoints don't hit Cloudinary on every request
+CACHE_TTL_SECONDS = 60
+
+_cache_lock = threading.RLock()
+_PHOTOS_CACHE = {'data': None, 'ts': 0}
+_COLLECTIONS_CACHE = {'data': None, 'ts': 0}
+
+# Derived indexes, rebuilt whenever the caches are replaced
+_PHOTOS_BY_COLLECTION = {}
+_COLLECTION_NAMES = {}
+_COLLECTION_NAME_SET = set()  # lowercased names, for uniqueness checks
+
+# High-water-mark ID counters, initialized on first cache population
+_NEXT_PHOTO_ID = None
+_NEXT_COLLECTION_ID = None
+
+# Bounded worker pool for overlapping independent Cloudinary calls
+_CLOUDINARY_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Worker pool + status map for background photo uploads
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+_UPLOAD_STATUS = {}
+
+# Parsed local fallback files, keyed by mtime so an unchanged file is
+# never re-read or re-parsed
+_LOCAL_PHOTOS_MTIME = None
+_LOCAL_PHOTOS_DATA = None
+_LOCAL_COLLECTIONS_MTIME = None
+_LOCAL_COLLECTIONS_DATA = None
+
+# Queue feeding the background writer that persists photo snapshots
+_PERSIST_QUEUE = queue.Queue()
+
+def _persist_worker():
+    """Write queued photo snapshots to disk, coalescing bursts into one dump"""
+    while True:
+        photos_data = _PERSIST_QUEUE.get()
+        # Coalesce: if more snapshots are queued, only the newest matters
+        try:
+            while True:
+                photos_data = _PERSIST_QUEUE.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            tmp_path = LOCAL_METADATA_FILE + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps(photos_data))
+            os.replace(tmp_path, LOCAL_METADATA_FILE)
+            print("💾 Persisted photos snapshot in background")
+        except Exception as e:
+            print(f"⚠️ Error persisting photos snapshot: {e}")
+
+def _persist_photos_async(photos_data):
+    """Hand the latest photos snapshot to the background writer"""
+    _PERSIST_QUEUE.put(photos_data)
+
+threading.Thread(target=_persist_worker, daemon=True).start()
+
+def _set_photos_cache(photos_data):
+    """Replace the cached photos list and rebuild the per-collection index"""
+    global _PHOTOS_BY_COLLECTION, _NEXT_PHOTO_ID
+    by_collection = defaultdict(list)
+    for photo in photos_data:
+        collection_id = photo.get('collection_id')
+        if collection_id in (None, ''):
+            photo['collection_id'] = None
+            continue
+        try:
+            collection_id = int(collection_id)
+        except (ValueError, TypeError):
+            photo['collection_id'] = None
+            continue
+        photo['collection_id'] = collection_id
+        by_collection[collection_id].append(photo)
+    highest_id = max((p['id'] for p in photos_data), default=0)
+    with _cache_lock:
+        _PHOTOS_CACHE['data'] = photos_data
+        _PHOTOS_CACHE['ts'] = time.monotonic()
+        _PHOTOS_BY_COLLECTION = by_collection
+        _NEXT_PHOTO_ID = max(_NEXT_PHOTO_ID or 1, highest_id + 1)
+
+def _set_collections_cache(collections_data):
+    """Replace the cached collections list and rebuild the name index"""
+    global _COLLECTION_NAMES, _COLLECTION_NAME_SET, _NEXT_COLLECTION_ID
+    names_by_id = {c['id']: c['name'] for c in collections_data}
+    name_set = {c['name'].lower() for c in collections_data}
+    highest_id = max((c['id'] for c in collections_data), default=0)
+    with _cache_lock:
+        _COLLECTIONS_CACHE['data'] = collections_data
+        _COLLECTIONS_CACHE['ts'] = time.monotonic()
+        _COLLECTION_NAMES = names_by_id
+        _COLLECTION_NAME_SET = name_set
+        _NEXT_COLLECTION_ID = max(_NEXT_COLLECTION_ID or 1, highest_id + 1)
+
+def _cache_fresh(cache):
+    """Check whether a cache entry is populated and within its TTL"""
+    return cache['data'] is not None and time.monotonic() - cache['ts'] < CACHE_TTL_SECONDS
+
+# Context keys are interned so repeated dict builds/lookups hit the same
+# string objects instead of re-hashing fresh ones
+_CONTEXT_KEYS = tuple(sys.intern(k) for k in (
+    'id', 'filename', 'title', 'description', 'collection_id', 'upload_date'))
+
+def _build_context(photo, collection_id):
+    """Build the Cloudinary context dict shared by the upload and re-tag paths"""
+    return dict(zip(_CONTEXT_KEYS, (
+        str(photo['id']),
+        photo['filename'],
+        photo['title'],
+        photo['description'],
+        str(collection_id) if collection_id else '',
+        photo['upload_date']
+    )))
+
 def load_photos_from_cloudinary():
     """Load photos metadata from Cloudinary by listing resources"""
     if not cloudinary_configured:
@@ -71,16 +252,25 @@ def load_photos_from_cloudinary():
     
     try:
         print("☁️ Loading photos from Cloudinary...")
-        # Get all resources from the gallery folder
-        result = cloudinary.api.resources(
-            type="upload",
-            prefix="georges_photo_gallery/",
-            max_results=500,
-            context=True
-        )
-        
+        # Page through the gallery folder, requesting only the fields we read
+        resources = []
+        next_cursor = None
+        while True:
+            result = cloudinary.api.resources(
+                type="upload",
+                prefix="georges_photo_gallery/",
+                max_results=500,
+                context=True,
+                fields="context,secure_url,public_id,created_at",
+                next_cursor=next_cursor
+            )
+            resources.extend(result.get('resources', []))
+            next_cursor = result.get('next_cursor')
+            if not next_cursor:
+                break
+
         photos_data = []
-        for resource in result.get('resources', []):
+        for resource in resources:
             # Extract metadata from context
             context = resource.get('context', {})
             
@@ -119,6 +309,7 @@ def load_photos_from_cloudinary():
 
 def load_collections_from_cloudinary():
     """Load collections metadata from Cloudinary"""
+    global _COLLECTIONS_ETAG, _COLLECTIONS_ETAG_BODY
     if not cloudinary_configured:
         print("⚠️ Cloudinary not configured, skipping collections download")
         return []
@@ -133,11 +324,20 @@ def load_collections_from_cloudinary():
         
         print(f"📄 Found collections file: {result.get('secure_url', 'URL not available')}")
         
-        # Download the JSON file
-        response = requests.get(result['secure_url'])
+        # Download the JSON file over the pooled session, skipping the body
+        # entirely when the CDN still has the version we already parsed
+        headers = {'If-None-Match': _COLLECTIONS_ETAG} if _COLLECTIONS_ETAG else {}
+        response = _SESSION.get(result['secure_url'], headers=headers, timeout=(3, 10))
+
+        if response.status_code == 304 and _COLLECTIONS_ETAG_BODY is not None:
+            print("✅ Collections unchanged (ETag match), reusing parsed copy")
+            return _COLLECTIONS_ETAG_BODY
+
         response.raise_for_status()
-        
-        collections_data = response.json()
+
+        collections_data = _json_loads(response.content)
+        _COLLECTIONS_ETAG = response.headers.get('ETag')
+        _COLLECTIONS_ETAG_BODY = collections_data
         print(f"✅ Loaded {len(collections_data)} collections from Cloudinary")
         return collections_data
         
@@ -157,12 +357,12 @@ def save_collections_to_cloudinary(collections_data):
     try:
         print("☁️ Saving collections to Cloudinary...")
         
-        # Convert to JSON string
-        collections_json = json.dumps(collections_data, indent=2)
-        print(f"📄 JSON size: {len(collections_json)} characters")
-        
-        # Create a file-like object from the JSON string
-        json_file = io.BytesIO(collections_json.encode('utf-8'))
+        # Convert to JSON bytes
+        collections_json = _json_dumps(collections_data)
+        print(f"📄 JSON size: {len(collections_json)} bytes")
+
+        # Create a file-like object from the JSON bytes
+        json_file = io.BytesIO(collections_json)
         
         # Upload as raw file with explicit content type
         upload_result = cloudinary.uploader.upload(
@@ -185,26 +385,36 @@ def save_collections_to_cloudinary(collections_data):
         return False
 
 def load_photos_data():
-    """Load photos metadata from Cloudinary first, then local fallback"""
+    """Load photos metadata, serving from the in-memory cache when fresh"""
+    with _cache_lock:
+        if _cache_fresh(_PHOTOS_CACHE):
+            return _PHOTOS_CACHE['data']
+    photos_data = _fetch_photos_data()
+    _set_photos_cache(photos_data)
+    return photos_data
+
+def _fetch_photos_data():
+    """Fetch photos metadata from Cloudinary first, then local fallback"""
     # Try Cloudinary first
     cloudinary_data = load_photos_from_cloudinary()
     if cloudinary_data:
-        # Save to local file as cache
-        try:
-            with open(LOCAL_METADATA_FILE, 'w') as f:
-                json.dump(cloudinary_data, f, indent=2)
-            print("💾 Cached photos metadata locally")
-        except:
-            pass
+        # Save to local file as cache (written in the background)
+        _persist_photos_async(cloudinary_data)
         return cloudinary_data
     
-    # Fallback to local file
+    # Fallback to local file (re-parsed only when its mtime changes)
+    global _LOCAL_PHOTOS_MTIME, _LOCAL_PHOTOS_DATA
     try:
         if os.path.exists(LOCAL_METADATA_FILE):
-            with open(LOCAL_METADATA_FILE, 'r') as f:
-                data = json.load(f)
-                print(f"📁 Loaded {len(data)} photos from local cache")
-                return data
+            mtime = os.stat(LOCAL_METADATA_FILE).st_mtime
+            if _LOCAL_PHOTOS_DATA is not None and mtime == _LOCAL_PHOTOS_MTIME:
+                return _LOCAL_PHOTOS_DATA
+            with open(LOCAL_METADATA_FILE, 'rb') as f:
+                data = _json_loads(f.read())
+            _LOCAL_PHOTOS_MTIME = mtime
+            _LOCAL_PHOTOS_DATA = data
+            print(f"📁 Loaded {len(data)} photos from local cache")
+            return data
         print("📁 No existing photos metadata found")
         return []
     except Exception as e:
@@ -212,32 +422,53 @@ def load_photos_data():
         return []
 
 def load_collections_data():
-    """Load collections metadata from Cloudinary first, then local fallback"""
+    """Load collections metadata, serving from the in-memory cache when fresh"""
+    with _cache_lock:
+        if _cache_fresh(_COLLECTIONS_CACHE):
+            return _COLLECTIONS_CACHE['data']
+    collections_data = _fetch_collections_data()
+    _set_collections_cache(collections_data)
+    return collections_data
+
+def _fetch_collections_data():
+    """Fetch collections metadata from Cloudinary first, then local fallback"""
     # Try Cloudinary first
     cloudinary_data = load_collections_from_cloudinary()
     if cloudinary_data:
         # Save to local file as cache
         try:
-            with open(LOCAL_COLLECTIONS_FILE, 'w') as f:
-                json.dump(cloudinary_data, f, indent=2)
+            with open(LOCAL_COLLECTIONS_FILE, 'wb') as f:
+                f.write(_json_dumps(cloudinary_data))
             print("💾 Cached collections metadata locally")
         except:
             pass
         return cloudinary_data
     
-    # Fallback to local file
+    # Fallback to local file (re-parsed only when its mtime changes)
+    global _LOCAL_COLLECTIONS_MTIME, _LOCAL_COLLECTIONS_DATA
     try:
         if os.path.exists(LOCAL_COLLECTIONS_FILE):
-            with open(LOCAL_COLLECTIONS_FILE, 'r') as f:
-                data = json.load(f)
-                print(f"📁 Loaded {len(data)} collections from local cache")
-                return data
+            mtime = os.stat(LOCAL_COLLECTIONS_FILE).st_mtime
+            if _LOCAL_COLLECTIONS_DATA is not None and mtime == _LOCAL_COLLECTIONS_MTIME:
+                return _LOCAL_COLLECTIONS_DATA
+            with open(LOCAL_COLLECTIONS_FILE, 'rb') as f:
+                data = _json_loads(f.read())
+            _LOCAL_COLLECTIONS_MTIME = mtime
+            _LOCAL_COLLECTIONS_DATA = data
+            print(f"📁 Loaded {len(data)} collections from local cache")
+            return data
         print("📁 No existing collections metadata found")
         return []
     except Exception as e:
         print(f"❌ Error loading collections metadata: {e}")
         return []
 
+def load_gallery_data():
+    """Load photos and collections concurrently to hide Cloudinary latency"""
+    photos_future = _CLOUDINARY_EXECUTOR.submit(load_photos_data)
+    collections_data = load_collections_data()
+    return photos_future.result(), collections_data
+
 def save_collections_data(collections_data):
     """Save collections metadata to both Cloudinary and local"""
     print(f"💾 Saving {len(collections_data)} collections...")
@@ -256,8 +487,8 @@ def save_collections_data(collections_data):
     # Save to local file as backup
     local_success = False
     try:
-        with open(LOCAL_COLLECTIONS_FILE, 'w') as f:
-            json.dump(collections_data, f, indent=2)
+        with open(LOCAL_COLLECTIONS_FILE, 'wb') as f:
+            f.write(_json_dumps(collections_data))
         print("💾 Collections saved locally")
         local_success = True
     except Exception as e:
@@ -270,44 +501,64 @@ def save_collections_data(collections_data):
         return local_success
 
 def get_next_photo_id():
-    """Get the next available photo ID"""
-    photos_data = load_photos_data()
-    if not photos_data:
-        return 1
-    return max(photo['id'] for photo in photos_data) + 1
+    """Allocate the next photo ID from the high-water-mark counter"""
+    global _NEXT_PHOTO_ID
+    load_photos_data()  # ensure the counter is initialized
+    with _cache_lock:
+        next_id = _NEXT_PHOTO_ID
+        _NEXT_PHOTO_ID = next_id + 1
+        return next_id
 
 def get_next_collection_id():
-    """Get the next available collection ID"""
-    collections_data = load_collections_data()
-    if not collections_data:
-        return 1
-    return max(collection['id'] for collection in collections_data) + 1
+    """Allocate the next collection ID from the high-water-mark counter"""
+    global _NEXT_COLLECTION_ID
+    load_collections_data()  # ensure the counter is initialized
+    with _cache_lock:
+        next_id = _NEXT_COLLECTION_ID
+        _NEXT_COLLECTION_ID = next_id + 1
+        return next_id
 
 def get_collection_photo_count(collection_id):
     """Get the number of photos in a collection"""
-    photos_data = load_photos_data()
-    return len([p for p in photos_data if p.get('collection_id') == collection_id])
+    load_photos_data()  # ensure the index is populated
+    with _cache_lock:
+        return len(_PHOTOS_BY_COLLECTION.get(collection_id, ()))
 
-def get_collection_name(collection_id):
-    """Get collection name by ID"""
-    if not collection_id:
-        return None
-    collections_data = load_collections_data()
-    collection = next((c for c in collections_data if c['id'] == collection_id), None)
-    return collection['name'] if collection else None
+# Admin credential, hashed once at startup for constant-time comparison.
+# No in-source default: with ADMIN_PASSWORD unset, every admin request
+# is refused rather than silently accepting a source-committed password.
+_admin_password = os.getenv('ADMIN_PASSWORD')
+if _admin_password:
+    _ADMIN_HASH = hashlib.sha256(_admin_password.encode()).digest()
+else:
+    print("❌ ADMIN_PASSWORD not set, admin endpoints are disabled")
+    _ADMIN_HASH = None
+del _admin_password
+
+def require_admin(f):
+    """Reject requests whose X-Admin-Password header doesn't match"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if _ADMIN_HASH is None:
+            return _json_response({'success': False, 'error': 'Unauthorized'}, 401)
+        password = request.headers.get('X-Admin-Password') or ''
+        digest = hashlib.sha256(password.encode()).digest()
+        if not hmac.compare_digest(digest, _ADMIN_HASH):
+            return _json_response({'success': False, 'error': 'Unauthorized'}, 401)
+        return f(*args, **kwargs)
+    return wrapper
 
 # Debug endpoint
 @app.route('/api/debug')
 def debug_info():
     """Debug endpoint to check configuration"""
-    photos_data = load_photos_data()
-    collections_data = load_collections_data()
-    return jsonify({
+    photos_data, collections_data = load_gallery_data()
+    return _json_response({
         'cloudinary_configured': cloudinary_configured,
         'environment_variables': {
-            'CLOUDINARY_CLOUD_NAME': '✅ SET' if os.getenv('CLOUDINARY_CLOUD_NAME') else '❌ MISSING',
-            'CLOUDINARY_API_KEY': '✅ SET' if os.getenv('CLOUDINARY_API_KEY') else '❌ MISSING',
-            'CLOUDINARY_API_SECRET': '✅ SET' if os.getenv('CLOUDINARY_API_SECRET') else '❌ MISSING'
+            'CLOUDINARY_CLOUD_NAME': '✅ SET' if cloud_name else '❌ MISSING',
+            'CLOUDINARY_API_KEY': '✅ SET' if api_key else '❌ MISSING',
+            'CLOUDINARY_API_SECRET': '✅ SET' if api_secret else '❌ MISSING'
         },
         'json_file_exists': os.path.exists(LOCAL_METADATA_FILE),
         'photos_count': len(photos_data),
@@ -319,39 +570,41 @@ def debug_info():
 @app.route('/api/collections', methods=['GET'])
 def get_collections():
     try:
-        collections_data = load_collections_data()
-        
-        # Add photo count to each collection
+        _, collections_data = load_gallery_data()
+
+        # Add photo count to shallow copies — the cached dicts get saved
+        # back to Cloudinary on writes, so derived keys must stay out
+        collections = []
         for collection in collections_data:
+            collection = dict(collection)
             collection['photo_count'] = get_collection_photo_count(collection['id'])
-        
-        return jsonify({
+            collections.append(collection)
+
+        return _json_response({
             'success': True,
-            'collections': collections_data
+            'collections': collections
         })
     except Exception as e:
         print(f"❌ Error getting collections: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/collections', methods=['POST'])
+@require_admin
 def create_collection():
     try:
-        # Verify admin password
-        password = request.headers.get('X-Admin-Password')
-        if password != 'Hanshow99@':
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
-        
         data = request.get_json()
         name = data.get('name', '').strip()
         
         if not name:
-            return jsonify({'success': False, 'error': 'Collection name is required'}), 400
+            return _json_response({'success': False, 'error': 'Collection name is required'}, 400)
         
         collections_data = load_collections_data()
         
-        # Check if name already exists
-        if any(c['name'].lower() == name.lower() for c in collections_data):
-            return jsonify({'success': False, 'error': 'Collection name already exists'}), 400
+        # Check if name already exists (O(1) against the lowercased name set)
+        with _cache_lock:
+            name_taken = name.lower() in _COLLECTION_NAME_SET
+        if name_taken:
+            return _json_response({'success': False, 'error': 'Collection name already exists'}, 400)
         
         # Create new collection
         new_collection = {
@@ -360,45 +613,42 @@ def create_collection():
             'created_date': datetime.now().isoformat()
         }
         
-        collections_data.append(new_collection)
-        
+        # Build a new list — the cache is only replaced once the save
+        # succeeds, so a failed save leaves no phantom collection behind
+        updated_collections = collections_data + [new_collection]
+
         # Save collections
-        if save_collections_data(collections_data):
+        if save_collections_data(updated_collections):
+            _set_collections_cache(updated_collections)
             print(f"📁 Created collection: {name}")
-            return jsonify({'success': True, 'collection': new_collection})
+            return _json_response({'success': True, 'collection': new_collection})
         else:
-            return jsonify({'success': False, 'error': 'Failed to save collection'}), 500
+            return _json_response({'success': False, 'error': 'Failed to save collection'}, 500)
         
     except Exception as e:
         print(f"❌ Error creating collection: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/collections/<int:collection_id>/photos', methods=['GET'])
 def get_collection_photos(collection_id):
     try:
-        photos_data = load_photos_data()
-        collections_data = load_collections_data()
-        
+        _, collections_data = load_gallery_data()  # also populates the photo index
+
         # Find collection
         collection = next((c for c in collections_data if c['id'] == collection_id), None)
         if not collection:
-            return jsonify({'success': False, 'error': 'Collection not found'}), 404
-        
-        # Filter photos by collection (handle both string and integer collection_id)
-        collection_photos = []
-        for photo in photos_data:
-            photo_collection_id = photo.get('collection_id')
-            if photo_collection_id is not None:
-                # Convert both to string for comparison to handle type mismatches
-                if str(photo_collection_id) == str(collection_id):
-                    collection_photos.append(photo)
+            return _json_response({'success': False, 'error': 'Collection not found'}, 404)
         
+        # Filter photos by collection via the cached index
+        with _cache_lock:
+            collection_photos = list(_PHOTOS_BY_COLLECTION.get(collection_id, ()))
+
         # Sort by upload_date descending
         collection_photos.sort(key=lambda x: x.get('upload_date', ''), reverse=True)
         
         print(f"📁 Collection {collection_id} ({collection['name']}): Found {len(collection_photos)} photos")
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'photos': collection_photos,
             'collection': collection,
@@ -407,82 +657,81 @@ def get_collection_photos(collection_id):
         
     except Exception as e:
         print(f"❌ Error getting collection photos: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/collections/<int:collection_id>', methods=['PUT'])
+@require_admin
 def update_collection(collection_id):
     try:
-        # Verify admin password
-        password = request.headers.get('X-Admin-Password')
-        if password != 'Hanshow99@':
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
-        
         data = request.get_json()
         name = data.get('name', '').strip()
         
         if not name:
-            return jsonify({'success': False, 'error': 'Collection name is required'}), 400
+            return _json_response({'success': False, 'error': 'Collection name is required'}, 400)
         
+        # Work on copies — the cached dicts are only replaced once the
+        # save succeeds, so a failed save leaves no half-applied rename
         collections_data = load_collections_data()
-        collection = next((c for c in collections_data if c['id'] == collection_id), None)
-        
+        updated_collections = [dict(c) for c in collections_data]
+        collection = next((c for c in updated_collections if c['id'] == collection_id), None)
+
         if not collection:
-            return jsonify({'success': False, 'error': 'Collection not found'}), 404
-        
+            return _json_response({'success': False, 'error': 'Collection not found'}, 404)
+
         # Check if name already exists (excluding current collection)
-        if any(c['name'].lower() == name.lower() and c['id'] != collection_id for c in collections_data):
-            return jsonify({'success': False, 'error': 'Collection name already exists'}), 400
-        
+        with _cache_lock:
+            name_taken = (name.lower() in _COLLECTION_NAME_SET
+                          and name.lower() != collection['name'].lower())
+        if name_taken:
+            return _json_response({'success': False, 'error': 'Collection name already exists'}, 400)
+
         # Update collection
         collection['name'] = name
-        
+
         # Save collections
-        if save_collections_data(collections_data):
+        if save_collections_data(updated_collections):
+            _set_collections_cache(updated_collections)
             print(f"📁 Updated collection: {name}")
-            return jsonify({'success': True, 'collection': collection})
+            return _json_response({'success': True, 'collection': collection})
         else:
-            return jsonify({'success': False, 'error': 'Failed to save collection'}), 500
+            return _json_response({'success': False, 'error': 'Failed to save collection'}, 500)
         
     except Exception as e:
         print(f"❌ Error updating collection: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/photos/<int:photo_id>/collection', methods=['PUT'])
+@require_admin
 def update_photo_collection(photo_id):
     try:
-        # Verify admin password
-        password = request.headers.get('X-Admin-Password')
-        if password != 'Hanshow99@':
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
-        
         data = request.get_json()
         collection_id = data.get('collection_id')
         
-        # Validate collection if provided
+        # Normalize to int once, then validate against the name index
         if collection_id:
-            collections_data = load_collections_data()
-            if not any(c['id'] == int(collection_id) for c in collections_data):
-                return jsonify({'success': False, 'error': 'Invalid collection ID'}), 400
-            collection_id = int(collection_id)
+            try:
+                collection_id = int(collection_id)
+            except (ValueError, TypeError):
+                return _json_response({'success': False, 'error': 'Invalid collection ID format'}, 400)
+            load_collections_data()  # ensure the index is populated
+            with _cache_lock:
+                collection_exists = collection_id in _COLLECTION_NAMES
+            if not collection_exists:
+                return _json_response({'success': False, 'error': 'Invalid collection ID'}, 400)
+        else:
+            collection_id = None
         
         photos_data = load_photos_data()
         photo = next((p for p in photos_data if p['id'] == photo_id), None)
         
         if not photo:
-            return jsonify({'success': False, 'error': 'Photo not found'}), 404
+            return _json_response({'success': False, 'error': 'Photo not found'}, 404)
         
         # Update photo collection in Cloudinary if configured
         if cloudinary_configured and 'cloudinary_public_id' in photo:
             try:
-                context = {
-                    'id': str(photo['id']),
-                    'filename': photo['filename'],
-                    'title': photo['title'],
-                    'description': photo['description'],
-                    'collection_id': str(collection_id) if collection_id else '',
-                    'upload_date': photo['upload_date']
-                }
-                
+                context = _build_context(photo, collection_id)
+
                 cloudinary.uploader.explicit(
                     photo['cloudinary_public_id'],
                     type="upload",
@@ -493,54 +742,147 @@ def update_photo_collection(photo_id):
                 
             except Exception as e:
                 print(f"⚠️ Error updating photo context in Cloudinary: {e}")
-                return jsonify({'success': False, 'error': 'Failed to update photo in Cloudinary'}), 500
+                return _json_response({'success': False, 'error': 'Failed to update photo in Cloudinary'}, 500)
         
         # Update photo collection in local data
         photo['collection_id'] = collection_id
-        
-        # Update local cache
-        try:
-            with open(LOCAL_METADATA_FILE, 'w') as f:
-                json.dump(photos_data, f, indent=2)
-            print(f"💾 Updated local photos cache")
-        except Exception as e:
-            print(f"⚠️ Error updating local cache: {e}")
-        
+        _set_photos_cache(photos_data)
+
+        # Persist the snapshot off the request thread
+        _persist_photos_async(photos_data)
+
         print(f"📸 Updated photo collection: {photo['title']} -> Collection {collection_id}")
-        return jsonify({'success': True})
+        return _json_response({'success': True})
         
     except Exception as e:
         print(f"❌ Error updating photo collection: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
+
+@app.route('/api/collections/<int:collection_id>/photos/batch', methods=['POST'])
+@require_admin
+def batch_update_collection_photos(collection_id):
+    try:
+        data = request.get_json()
+        photo_ids = data.get('photo_ids') or []
+
+        if not photo_ids:
+            return _json_response({'success': False, 'error': 'photo_ids is required'}, 400)
+
+        try:
+            photo_ids = {int(pid) for pid in photo_ids}
+        except (ValueError, TypeError):
+            return _json_response({'success': False, 'error': 'Invalid photo ID format'}, 400)
+
+        collections_data = load_collections_data()
+        if not any(c['id'] == collection_id for c in collections_data):
+            return _json_response({'success': False, 'error': 'Collection not found'}, 404)
+
+        photos_data = load_photos_data()
+        photos = [p for p in photos_data if p['id'] in photo_ids]
+
+        if len(photos) != len(photo_ids):
+            return _json_response({'success': False, 'error': 'One or more photo IDs not found'}, 404)
+
+        # Update Cloudinary context in batches of 100 public_ids per call
+        if cloudinary_configured:
+            public_ids = [p['cloudinary_public_id'] for p in photos if 'cloudinary_public_id' in p]
+            try:
+                for i in range(0, len(public_ids), 100):
+                    cloudinary.uploader.add_context(
+                        f'collection_id={collection_id}',
+                        public_ids[i:i + 100]
+                    )
+                print(f"✅ Batch-updated {len(public_ids)} photos in Cloudinary")
+            except Exception as e:
+                print(f"⚠️ Error batch-updating photo context in Cloudinary: {e}")
+                return _json_response({'success': False, 'error': 'Failed to update photos in Cloudinary'}, 500)
+
+        # Update photo collections in local data
+        for photo in photos:
+            photo['collection_id'] = collection_id
+        _set_photos_cache(photos_data)
+
+        # Persist the snapshot off the request thread
+        _persist_photos_async(photos_data)
+
+        print(f"📸 Moved {len(photos)} photos to collection {collection_id}")
+        return _json_response({'success': True, 'updated': len(photos)})
+
+    except Exception as e:
+        print(f"❌ Error batch updating photo collections: {e}")
+        return _json_response({'success': False, 'error': str(e)}, 500)
+
+def _upload_photo_worker(tmp_path, photo_data, context, public_id):
+    """Background task: push a spooled upload to Cloudinary and update caches"""
+    photo_id = photo_data['id']
+    try:
+        print(f"📸 Uploading photo: {photo_data['filename']} (ID: {photo_id})")
+
+        # Upload to Cloudinary in chunks so large images never sit
+        # fully in memory
+        with open(tmp_path, 'rb') as f:
+            upload_result = cloudinary.uploader.upload_large(
+                f,
+                public_id=public_id,
+                folder="georges_photo_gallery",
+                context=context,
+                resource_type="image",
+                chunk_size=6_000_000
+            )
+
+        print("✅ Cloudinary upload successful")
+
+        photo_data['cloudinary_url'] = upload_result['secure_url']
+        photo_data['cloudinary_public_id'] = upload_result['public_id']
+        photo_data['image_url'] = upload_result['secure_url']
+
+        # Append to the in-memory cache so reads see the new photo
+        with _cache_lock:
+            if _PHOTOS_CACHE['data'] is not None:
+                _set_photos_cache(_PHOTOS_CACHE['data'] + [photo_data])
+            _UPLOAD_STATUS[photo_id] = {'status': 'done'}
+
+        print(f"✅ Metadata stored in context: {{'collection_id': '{photo_data['collection_id']}'}}")
+
+    except Exception as e:
+        print(f"❌ Cloudinary upload failed: {e}")
+        with _cache_lock:
+            _UPLOAD_STATUS[photo_id] = {'status': 'failed', 'error': str(e)}
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 # Photos API Routes (Updated with Collections Support)
 @app.route('/api/photos', methods=['GET'])
 def get_photos():
     try:
-        photos_data = load_photos_data()
-        collections_data = load_collections_data()
-        
-        # Add collection name to photos
+        photos_data, _ = load_gallery_data()  # also populates the name index
+
+        # Add collection name to shallow copies — the cached dicts get
+        # persisted and served elsewhere, so derived keys must stay out
+        with _cache_lock:
+            names_by_id = _COLLECTION_NAMES
+        photos = []
         for photo in photos_data:
-            if photo.get('collection_id'):
-                photo['collection_name'] = get_collection_name(photo['collection_id'])
-        
-        return jsonify({
+            photo = dict(photo)
+            collection_id = photo.get('collection_id')
+            photo['collection_name'] = names_by_id.get(collection_id) if collection_id else None
+            photos.append(photo)
+
+        return _json_response({
             'success': True,
-            'photos': photos_data
+            'photos': photos
         })
     except Exception as e:
         print(f"❌ Error getting photos: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/photos', methods=['POST'])
+@require_admin
 def upload_photo():
     try:
-        # Verify admin password
-        password = request.headers.get('X-Admin-Password')
-        if password != 'Hanshow99@':
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
-        
         # Get form data
         title = request.form.get('title', 'Untitled')
         description = request.form.get('description', '')
@@ -552,19 +894,19 @@ def upload_photo():
                 collection_id = int(collection_id)
                 collections_data = load_collections_data()
                 if not any(c['id'] == collection_id for c in collections_data):
-                    return jsonify({'success': False, 'error': 'Invalid collection ID'}), 400
+                    return _json_response({'success': False, 'error': 'Invalid collection ID'}, 400)
             except ValueError:
-                return jsonify({'success': False, 'error': 'Invalid collection ID format'}), 400
+                return _json_response({'success': False, 'error': 'Invalid collection ID format'}, 400)
         else:
             collection_id = None
         
         # Check if file is provided
         if 'photo' not in request.files:
-            return jsonify({'success': False, 'error': 'No photo file provided'}), 400
+            return _json_response({'success': False, 'error': 'No photo file provided'}, 400)
         
         file = request.files['photo']
         if file.filename == '':
-            return jsonify({'success': False, 'error': 'No photo file selected'}), 400
+            return _json_response({'success': False, 'error': 'No photo file selected'}, 400)
         
         # Generate unique filename
         file_extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else 'jpg'
@@ -573,75 +915,72 @@ def upload_photo():
         # Get next photo ID
         photo_id = get_next_photo_id()
         
-        # Upload to Cloudinary if configured
-        if cloudinary_configured:
-            try:
-                # Prepare context metadata
-                context = {
-                    'id': str(photo_id),
-                    'filename': file.filename,
-                    'title': title,
-                    'description': description,
-                    'collection_id': str(collection_id) if collection_id else '',
-                    'upload_date': datetime.now().isoformat()
-                }
-                
-                print(f"📸 Uploading photo: {file.filename} (ID: {photo_id}, Collection: {collection_id})")
-                
-                # Upload to Cloudinary
-                upload_result = cloudinary.uploader.upload(
-                    file,
-                    public_id=f"photo_{photo_id}_{unique_filename}",
-                    folder="georges_photo_gallery",
-                    context=context
-                )
-                
-                print("✅ Cloudinary upload successful")
-                
-                # Create photo data
-                photo_data = {
-                    'id': photo_id,
-                    'filename': file.filename,
-                    'title': title,
-                    'description': description,
-                    'collection_id': collection_id,
-                    'cloudinary_url': upload_result['secure_url'],
-                    'cloudinary_public_id': upload_result['public_id'],
-                    'image_url': upload_result['secure_url'],
-                    'upload_date': datetime.now().isoformat(),
-                    'storage_type': 'cloudinary'
-                }
-                
-                print(f"✅ Metadata stored in context: {{'collection_id': '{collection_id}'}}")
-                
-                return jsonify({
-                    'success': True,
-                    'photo': photo_data
-                })
-                
-            except Exception as e:
-                print(f"❌ Cloudinary upload failed: {e}")
-                return jsonify({'success': False, 'error': f'Upload failed: {str(e)}'}), 500
-        else:
-            return jsonify({'success': False, 'error': 'Cloudinary not configured'}), 500
-            
+        if not cloudinary_configured:
+            return _json_response({'success': False, 'error': 'Cloudinary not configured'}, 500)
+
+        photo_data = {
+            'id': photo_id,
+            'filename': file.filename,
+            'title': title,
+            'description': description,
+            'collection_id': collection_id,
+            'upload_date': datetime.now().isoformat(),
+            'storage_type': 'cloudinary'
+        }
+
+        # Prepare context metadata
+        context = _build_context(photo_data, collection_id)
+
+        # Spool the file to disk; the Cloudinary push happens in the background
+        fd, tmp_path = tempfile.mkstemp(suffix=f".{file_extension}")
+        with os.fdopen(fd, 'wb') as tmp:
+            file.save(tmp)
+
+        with _cache_lock:
+            _UPLOAD_STATUS[photo_id] = {'status': 'uploading'}
+
+        print(f"📸 Queued photo upload: {file.filename} (ID: {photo_id}, Collection: {collection_id})")
+        _UPLOAD_EXECUTOR.submit(
+            _upload_photo_worker,
+            tmp_path,
+            photo_data,
+            context,
+            f"photo_{photo_id}_{unique_filename}"
+        )
+
+        # 202: accepted, poll /api/photos/<id>/status for completion
+        return _json_response({
+            'success': True,
+            'photo': photo_data,
+            'status': 'uploading'
+        }, 202)
+
     except Exception as e:
         print(f"❌ Error uploading photo: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
+
+@app.route('/api/photos/<int:photo_id>/status', methods=['GET'])
+def get_photo_upload_status(photo_id):
+    """Report progress of a background photo upload"""
+    with _cache_lock:
+        status = _UPLOAD_STATUS.get(photo_id)
+    if status is None:
+        # Not a tracked upload; report done if the photo already exists
+        if any(p['id'] == photo_id for p in load_photos_data()):
+            status = {'status': 'done'}
+        else:
+            return _json_response({'success': False, 'error': 'Photo not found'}, 404)
+    return _json_response({'success': True, 'photo_id': photo_id, **status})
 
 @app.route('/api/photos/<int:photo_id>', methods=['DELETE'])
+@require_admin
 def delete_photo(photo_id):
     try:
-        # Verify admin password
-        password = request.headers.get('X-Admin-Password')
-        if password != 'Hanshow99@':
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
-        
         photos_data = load_photos_data()
         photo = next((p for p in photos_data if p['id'] == photo_id), None)
         
         if not photo:
-            return jsonify({'success': False, 'error': 'Photo not found'}), 404
+            return _json_response({'success': False, 'error': 'Photo not found'}, 404)
         
         # Delete from Cloudinary if configured
         if cloudinary_configured and 'cloudinary_public_id' in photo:
@@ -653,31 +992,36 @@ def delete_photo(photo_id):
         
         # Remove from local data
         photos_data = [p for p in photos_data if p['id'] != photo_id]
-        
-        # Save updated data
-        try:
-            with open(LOCAL_METADATA_FILE, 'w') as f:
-                json.dump(photos_data, f, indent=2)
-            print(f"💾 Updated local photos cache")
-        except Exception as e:
-            print(f"⚠️ Error updating local cache: {e}")
-        
+        _set_photos_cache(photos_data)
+
+        # Persist the snapshot off the request thread
+        _persist_photos_async(photos_data)
+
         print(f"🗑️ Deleted photo: {photo['title']}")
-        return jsonify({'success': True})
+        return _json_response({'success': True})
         
     except Exception as e:
         print(f"❌ Error deleting photo: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}, 500)
 
-# Serve the main page
+# Serve the main page (fallback when WhiteNoise doesn't handle it)
 @app.route('/')
 def index():
-    return send_from_directory(app.static_folder, 'index.html')
+    response = send_from_directory(app.static_folder, 'index.html', conditional=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
-# Serve static files
+# Serve static files (fallback when WhiteNoise doesn't handle them)
 @app.route('/<path:filename>')
 def serve_static(filename):
-    return send_from_directory(app.static_folder, filename)
+    response = send_from_directory(app.static_folder, filename, conditional=True)
+    # Same split as the WhiteNoise layer: only fingerprinted bundles
+    # under assets/ are safe to cache forever
+    if filename.startswith('assets/'):
+        response.headers['Cache-Control'] = 'max-age=31536000, public, immutable'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 if __name__ == '__main__':
     print("🚀 Running with gunicorn")
@@ -1,3 +1,2 @@
 #!/bin/bash
-gunicorn app:app --host 0.0.0.0 --port $PORT
-
+gunicorn app:app --bind 0.0.0.0:$PORT --worker-class gthread --threads 16